@@ -1,7 +1,7 @@
 #!/usr/bin/env -S uv run --script
 # /// script
-# dependencies = ["mcp>=0.3.0"]
-# requires-python = ">=3.8"
+# dependencies = ["mcp>=0.3.0", "orjson>=3.0"]
+# requires-python = ">=3.10"
 # ///
 
 """
@@ -42,20 +42,31 @@ The knowledge tree structure:
       │   ├── element1.json
       │   ├── element2.json
       │   └── ...
+      ├── index.json         # Element summaries (no code) for listing/tree views
       └── metadata.json      # Global metadata and statistics
 """
 
 import json
 import os
+import re
 import argparse
 import sys
+import tempfile
+import time
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, asdict
+from array import array
+from collections import Counter
+from typing import Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass, fields, replace, MISSING
 from datetime import datetime
 
 from mcp.server.fastmcp import FastMCP
 
+try:
+    import orjson
+except ImportError:  # Optional: fall back to the stdlib json module
+    orjson = None
+
 # Initialize the MCP server
 mcp = FastMCP("Code Knowledge Tree Server")
 
@@ -63,8 +74,26 @@ mcp = FastMCP("Code Knowledge Tree Server")
 KNOWLEDGE_BASE_DIR: Path = None
 ELEMENTS_DIR: Path = None
 METADATA_FILE: Path = None
+INDEX_FILE: Path = None
+BASE_WORKING_DIR: Path = None
+_BASE_IS_ABSOLUTE: bool = False
+
+# get_working_directory_info re-checks that the knowledge tree exists at most
+# once per TTL, so clients polling it do not each cost a stat
+_KB_EXISTS_TTL = 1.0
+_kb_exists: bool = False
+_kb_exists_checked_at: float = float("-inf")
+
+# Line patterns used by import_from_analysis_file
+# Function header: the name runs up to the first '(' or the next 'function '
+# (matching the original split-based parsing); the line must contain a '('
+_FUNC_RE = re.compile(r'^function (?=.*\()((?:(?!function )[^(])*)')
+_DEP_HINT_RE = re.compile(r'DEPENDENCIES|CALLS:', re.IGNORECASE)
+_R_MOD_RE = re.compile(r'r\((\d+)\)')
+# r(nnnn) module references (group 1) or name() calls (group 2) in one scan
+_DEP_REF_RE = re.compile(r'r\((\d+)\)|(\w+)\(\)')
 
-@dataclass
+@dataclass(slots=True)
 class CodeElement:
     """Represents a code element in the knowledge tree"""
     id: str
@@ -78,6 +107,42 @@ class CodeElement:
     created_at: str = ""
     updated_at: str = ""
 
+# (name, default) for every CodeElement field, used when loading from disk
+_ELEMENT_FIELD_DEFAULTS = tuple(
+    (field.name, None if field.default is MISSING else field.default)
+    for field in fields(CodeElement)
+)
+
+# In-memory cache of loaded elements, keyed by element id
+_ELEMENT_CACHE: Dict[str, CodeElement] = {}
+# Elements directory and element file mtimes when the index was last
+# synced with the files
+_DISK_MTIME_NS: Optional[int] = None
+_FILE_MTIMES: Dict[str, int] = {}
+
+# Element files that could not be parsed (left out of the index), keyed by
+# element ID, with the error; retried once the file changes
+_UNREADABLE_FILES: Dict[str, str] = {}
+
+# Metadata is written once per tool call instead of on every save
+_metadata_dirty: bool = False
+_metadata_created_at: Optional[str] = None
+_cached_element_count: int = 0
+
+# Summary of every element without its code, persisted as index.json so
+# listing and tree views never have to parse the full element files
+_INDEX: Dict[str, Dict[str, Any]] = {}
+_INDEX_LOADED: bool = False
+_index_dirty: bool = False
+
+# IDs of indexed elements that nothing depends on (tree-view roots)
+_ROOTS: set = set()
+
+# Column-wise view of the index used by get_knowledge_tree_stats, rebuilt
+# after any index change: (types, dependency counts, dependent counts,
+# missing ids, dependency cycles, cycle-breaking edges)
+_STATS_COLUMNS: Optional[Tuple[List[str], array, array, set, List[List[str]], List[List[str]]]] = None
+
 def initialize_working_directory(working_dir: str = "."):
     """
     Initialize the global path configuration based on the working directory.
@@ -86,16 +151,40 @@ def initialize_working_directory(working_dir: str = "."):
     Args:
         working_dir: Base directory where the knowledge-tree folder should be created
     """
-    global KNOWLEDGE_BASE_DIR, ELEMENTS_DIR, METADATA_FILE
+    global KNOWLEDGE_BASE_DIR, ELEMENTS_DIR, METADATA_FILE, INDEX_FILE, _DISK_MTIME_NS
+    global BASE_WORKING_DIR, _BASE_IS_ABSOLUTE, _kb_exists_checked_at
+    global _metadata_dirty, _metadata_created_at, _cached_element_count
+    global _INDEX_LOADED, _index_dirty, _STATS_COLUMNS
     
     # The working directory is the base, and we create knowledge-tree inside it
-    base_working_dir = Path(working_dir).resolve()
-    KNOWLEDGE_BASE_DIR = base_working_dir / "knowledge-tree"
+    BASE_WORKING_DIR = Path(working_dir).resolve()
+    _BASE_IS_ABSOLUTE = BASE_WORKING_DIR.is_absolute()
+    KNOWLEDGE_BASE_DIR = BASE_WORKING_DIR / "knowledge-tree"
     ELEMENTS_DIR = KNOWLEDGE_BASE_DIR / "elements"
     METADATA_FILE = KNOWLEDGE_BASE_DIR / "metadata.json"
+    INDEX_FILE = KNOWLEDGE_BASE_DIR / "index.json"
+    
+    # Drop anything cached from a previous working directory
+    _ELEMENT_CACHE.clear()
+    _DISK_MTIME_NS = None
+    _FILE_MTIMES.clear()
+    _UNREADABLE_FILES.clear()
+    _INDEX.clear()
+    _ROOTS.clear()
+    _INDEX_LOADED = False
+    _STATS_COLUMNS = None
+    _index_dirty = False
+    _kb_exists_checked_at = float("-inf")
     
     # Ensure the directory structure exists
     ensure_knowledge_base()
+    
+    _metadata_dirty = False
+    _metadata_created_at = None
+    
+    # Load (or rebuild and repair) the index up front
+    _ensure_index_loaded()
+    _cached_element_count = len(_INDEX)
 
 def ensure_knowledge_base():
     """Ensure the knowledge base directory structure exists"""
@@ -103,65 +192,521 @@ def ensure_knowledge_base():
     ELEMENTS_DIR.mkdir(exist_ok=True)
     
     if not METADATA_FILE.exists():
+        now = datetime.now().isoformat()
         initial_metadata = {
-            "created_at": datetime.now().isoformat(),
+            "created_at": now,
             "total_elements": 0,
-            "last_updated": datetime.now().isoformat()
+            "last_updated": now
         }
-        with open(METADATA_FILE, 'w') as f:
-            json.dump(initial_metadata, f, indent=2)
+        _write_json(METADATA_FILE, initial_metadata)
+
+def _read_json(path: Path) -> Dict[str, Any]:
+    """Read a JSON file, using orjson when it is available"""
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _write_json(path: Path, data: Dict[str, Any]):
+    """
+    Write data as indented JSON, using orjson when it is available.
+    The file is written to a uniquely named temp file next to the target and
+    renamed over it, so readers never see a partially written file and
+    concurrent writers never share a temp file.
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    try:
+        if orjson is not None:
+            with open(fd, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+        os.chmod(tmp_name, 0o644)  # mkstemp creates files readable by the owner only
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+def _element_from_dict(data: Dict[str, Any]) -> CodeElement:
+    """
+    Build a CodeElement from its stored dict without going through the
+    dataclass __init__. Stored dicts come from _element_to_dict(), so only
+    the optional fields can be absent (files from older versions).
+    """
+    element = object.__new__(CodeElement)
+    for name, default in _ELEMENT_FIELD_DEFAULTS:
+        setattr(element, name, data.get(name, default))
+    return element
+
+def _element_to_dict(element: CodeElement) -> Dict[str, Any]:
+    """
+    Read a CodeElement's slots into a dict for storage. Unlike asdict() the
+    dependency lists are not deep-copied; the dict is serialized right away.
+    """
+    return {name: getattr(element, name) for name in CodeElement.__slots__}
+
+def _copy_element(element: CodeElement) -> CodeElement:
+    """
+    Copy an element with its own dependency lists. The cache only hands out
+    and keeps copies, so changes a tool makes are not visible to later calls
+    unless save_element succeeds.
+    """
+    return replace(element, dependencies=list(element.dependencies), dependents=list(element.dependents))
 
 def load_element(element_id: str) -> Optional[CodeElement]:
-    """Load a code element from storage"""
-    element_file = ELEMENTS_DIR / f"{element_id}.json"
-    if not element_file.exists():
-        return None
+    """Load a code element from storage (served from the cache when possible)"""
+    if _INDEX_LOADED:
+        # The index lists every element file, so a miss needs no open()
+        _refresh_from_disk()
+        if element_id not in _INDEX:
+            return None
+    cached = _ELEMENT_CACHE.get(element_id)
+    if cached is not None:
+        return _copy_element(cached)
     
-    with open(element_file, 'r') as f:
-        data = json.load(f)
-        return CodeElement(**data)
+    try:
+        element = _element_from_dict(_read_json(ELEMENTS_DIR / f"{element_id}.json"))
+    except FileNotFoundError:
+        return None
+    _ELEMENT_CACHE[element_id] = element
+    return _copy_element(element)
 
-def save_element(element: CodeElement) -> bool:
-    """Save a code element to storage"""
-    ensure_knowledge_base()
+def save_element(element: CodeElement, now: Optional[str] = None) -> bool:
+    """
+    Save a code element to storage (metadata is flushed by update_metadata).
+    Tools pass one `now` timestamp for all the saves they make.
+    """
+    ELEMENTS_DIR.mkdir(parents=True, exist_ok=True)
+    _store_element(element, now or datetime.now().isoformat())
+    return True
+
+def save_elements_bulk(elements: List[CodeElement], now: Optional[str] = None) -> Dict[str, str]:
+    """
+    Save several code elements in one pass: the elements directory is checked
+    once and every element costs a single file write. All elements share one
+    `now` timestamp; metadata is flushed by update_metadata.
+    
+    Returns:
+        The IDs of the elements that could not be written, mapped to the error
+    """
+    failed = {}
+    if not elements:
+        return failed
+    ELEMENTS_DIR.mkdir(parents=True, exist_ok=True)
     
-    element.updated_at = datetime.now().isoformat()
+    now = now or datetime.now().isoformat()
+    for element in elements:
+        try:
+            _store_element(element, now)
+        except Exception as e:
+            failed[element.id] = str(e)
+    return failed
+
+def _store_element(element: CodeElement, now: str):
+    """Write one element file, then record it in the index and the cache"""
+    global _metadata_dirty, _cached_element_count
+    element.updated_at = now
     if not element.created_at:
-        element.created_at = element.updated_at
+        element.created_at = now
     
+    # The index mirrors the element files, so no stat is needed to spot new
+    # ones; it is only touched once the file is written
+    is_new = element.id not in known_ids()
     element_file = ELEMENTS_DIR / f"{element.id}.json"
-    with open(element_file, 'w') as f:
-        json.dump(asdict(element), f, indent=2)
-    
-    # Update metadata
-    update_metadata()
-    return True
+    _write_json(element_file, _element_to_dict(element))
+    _mark_synced(element_file)
+    if is_new:
+        _cached_element_count += 1
+    _write_index_entry(element)
+    _ELEMENT_CACHE[element.id] = _copy_element(element)
+    _metadata_dirty = True
 
-def update_metadata():
-    """Update global metadata"""
-    element_count = len(list(ELEMENTS_DIR.glob("*.json")))
+def update_metadata(now: Optional[str] = None):
+    """Write global metadata and the element index if they changed since the last write"""
+    global _metadata_dirty, _index_dirty, _metadata_created_at
+    if _index_dirty:
+        _write_json(INDEX_FILE, _INDEX)
+        _index_dirty = False
+    
+    if not _metadata_dirty:
+        return
+    
+    now = now or datetime.now().isoformat()
     metadata = {
-        "total_elements": element_count,
-        "last_updated": datetime.now().isoformat()
+        "total_elements": _cached_element_count,
+        "last_updated": now
     }
     
-    if METADATA_FILE.exists():
-        with open(METADATA_FILE, 'r') as f:
-            existing = json.load(f)
-            metadata["created_at"] = existing.get("created_at", datetime.now().isoformat())
+    if _metadata_created_at is None:
+        try:
+            _metadata_created_at = _read_json(METADATA_FILE).get("created_at", now)
+        except FileNotFoundError:
+            _metadata_created_at = now
+    metadata["created_at"] = _metadata_created_at
     
-    with open(METADATA_FILE, 'w') as f:
-        json.dump(metadata, f, indent=2)
-
-def get_all_elements() -> List[CodeElement]:
-    """Get all elements from the knowledge base"""
-    elements = []
-    for element_file in ELEMENTS_DIR.glob("*.json"):
-        element_id = element_file.stem
-        element = load_element(element_id)
-        if element:
-            elements.append(element)
-    return elements
+    _write_json(METADATA_FILE, metadata)
+    _metadata_dirty = False
+
+def _iter_element_ids():
+    """Yield the ID of every element file in the elements directory"""
+    with os.scandir(ELEMENTS_DIR) as entries:
+        for entry in entries:
+            name = entry.name
+            if name.endswith('.json') and entry.is_file():
+                yield name[:-5]
+
+def _refresh_from_disk():
+    """
+    Pick up element files that another process added, rewrote or deleted
+    since the index was last synced. A change is detected through the
+    elements directory mtime, so this costs a single stat when nothing
+    changed; then the file mtimes tell which elements to re-read.
+    """
+    global _DISK_MTIME_NS, _cached_element_count, _index_dirty, _STATS_COLUMNS
+    mtime_ns = ELEMENTS_DIR.stat().st_mtime_ns
+    if mtime_ns == _DISK_MTIME_NS:
+        return
+    _DISK_MTIME_NS = mtime_ns
+    
+    file_mtimes = _element_file_mtimes()
+    removed = [element_id for element_id in _FILE_MTIMES if element_id not in file_mtimes]
+    changed = sorted(
+        element_id for element_id, file_mtime in file_mtimes.items()
+        if _FILE_MTIMES.get(element_id) != file_mtime
+    )
+    if not removed and not changed:
+        return
+    
+    for element_id in removed:
+        del _FILE_MTIMES[element_id]
+        _UNREADABLE_FILES.pop(element_id, None)
+        _INDEX.pop(element_id, None)
+        _ROOTS.discard(element_id)
+        _ELEMENT_CACHE.pop(element_id, None)
+    for element_id in changed:
+        _FILE_MTIMES[element_id] = file_mtimes[element_id]
+        _ELEMENT_CACHE.pop(element_id, None)
+        element = _read_element_file(element_id)
+        if element is None:  # Unreadable, or deleted again while scanning
+            _INDEX.pop(element_id, None)
+            _ROOTS.discard(element_id)
+            continue
+        _ELEMENT_CACHE[element_id] = element
+        _INDEX[element_id] = _index_entry(element)
+        if element.dependents:
+            _ROOTS.discard(element_id)
+        else:
+            _ROOTS.add(element_id)
+    
+    _cached_element_count = len(_INDEX)
+    _index_dirty = True
+    _STATS_COLUMNS = None
+
+def _read_element_file(element_id: str) -> Optional[CodeElement]:
+    """
+    Parse an element file for the index. A missing file gives None; so does
+    a malformed one, which is recorded in _UNREADABLE_FILES instead of
+    failing the whole scan.
+    """
+    try:
+        element = _element_from_dict(_read_json(ELEMENTS_DIR / f"{element_id}.json"))
+    except FileNotFoundError:
+        _UNREADABLE_FILES.pop(element_id, None)
+        return None
+    except (OSError, ValueError, AttributeError) as e:  # AttributeError: not a JSON object
+        _UNREADABLE_FILES[element_id] = str(e)
+        return None
+    _UNREADABLE_FILES.pop(element_id, None)
+    return element
+
+def _mark_synced(element_file: Path):
+    """
+    Record the new mtimes after this process wrote or deleted an element
+    file, so its own changes do not trigger a rescan
+    """
+    global _DISK_MTIME_NS
+    if not _INDEX_LOADED:
+        return
+    element_id = element_file.name[:-5]
+    _UNREADABLE_FILES.pop(element_id, None)
+    try:
+        _FILE_MTIMES[element_id] = element_file.stat().st_mtime_ns
+    except FileNotFoundError:
+        _FILE_MTIMES.pop(element_id, None)
+    _DISK_MTIME_NS = ELEMENTS_DIR.stat().st_mtime_ns
+
+def find_dependents(element_id: str) -> List[str]:
+    """Get the IDs of all elements that list element_id as a dependency"""
+    return [other_id for other_id, entry in get_index().items() if element_id in entry["dependencies"]]
+
+def sync_dependents(
+    element_id: str,
+    original_deps: List[str],
+    new_deps: List[str],
+    now: Optional[str] = None
+):
+    """
+    Update the dependents lists of the elements an element used to depend on
+    and now depends on. Each affected neighbour is loaded and written at most
+    once; dependencies present in both lists are not touched.
+    """
+    original_set = set(original_deps)
+    new_set = set(new_deps)
+    
+    # Net change per neighbour: should element_id be among its dependents?
+    neighbor_changes: Dict[str, bool] = {}
+    for dep_id in original_deps:
+        if dep_id not in new_set:
+            neighbor_changes[dep_id] = False
+    for dep_id in new_deps:
+        if dep_id not in original_set:
+            neighbor_changes[dep_id] = True
+    
+    known = known_ids()
+    for neighbor_id, should_be_dependent in neighbor_changes.items():
+        if neighbor_id not in known:
+            continue
+        neighbor = load_element(neighbor_id)
+        if not neighbor:
+            continue
+        is_dependent = element_id in neighbor.dependents
+        if should_be_dependent and not is_dependent:
+            neighbor.dependents.append(element_id)
+        elif is_dependent and not should_be_dependent:
+            neighbor.dependents.remove(element_id)
+        else:
+            continue
+        save_element(neighbor, now)
+
+def _index_entry(element: CodeElement) -> Dict[str, Any]:
+    """Build the index entry (everything except the code) for an element"""
+    return {
+        "type": element.type,
+        "description": element.description,
+        "dependencies": list(element.dependencies),
+        "dependents": list(element.dependents),
+        "created_at": element.created_at
+    }
+
+def _element_file_mtimes() -> Dict[str, int]:
+    """Get the modification time (ns) of every element file, keyed by element ID"""
+    with os.scandir(ELEMENTS_DIR) as entries:
+        return {
+            entry.name[:-5]: entry.stat().st_mtime_ns
+            for entry in entries
+            if entry.name.endswith('.json') and entry.is_file()
+        }
+
+def _repair_dependents():
+    """
+    Make every element's dependents list the reverse of the dependencies
+    lists, rewriting the elements that disagree. Runs when the index is
+    rebuilt, which covers knowledge bases written before dependents were
+    kept complete and element files edited by hand.
+    """
+    dependents_of = {element_id: [] for element_id in _INDEX}
+    for element_id, entry in _INDEX.items():
+        for dep_id in dict.fromkeys(entry["dependencies"]):
+            if dep_id in dependents_of:
+                dependents_of[dep_id].append(element_id)
+    
+    for element_id, expected in dependents_of.items():
+        element = _ELEMENT_CACHE[element_id]
+        expected_set = set(expected)
+        current_set = set(element.dependents)
+        # Keep the existing order, drop stale entries, append missing ones
+        repaired = [dep_id for dep_id in dict.fromkeys(element.dependents) if dep_id in expected_set]
+        repaired.extend(dep_id for dep_id in expected if dep_id not in current_set)
+        if repaired != element.dependents:
+            repaired_element = replace(element, dependents=repaired)
+            element_file = ELEMENTS_DIR / f"{element_id}.json"
+            try:
+                _write_json(element_file, _element_to_dict(repaired_element))
+                _FILE_MTIMES[element_id] = element_file.stat().st_mtime_ns
+            except OSError:
+                continue  # Left as it is; retried on the next rebuild
+            _ELEMENT_CACHE[element_id] = repaired_element
+            _INDEX[element_id]["dependents"] = list(repaired)
+
+def _ensure_index_loaded():
+    """
+    Load index.json, rebuilding it from the element files if it is missing,
+    unreadable or stale. It is stale when its IDs differ from the element
+    files, or when an element file changed after it was written (a call
+    interrupted before update_metadata, or an element file edited by hand).
+    """
+    global _INDEX_LOADED, _DISK_MTIME_NS
+    if _INDEX_LOADED:
+        _refresh_from_disk()
+        return
+    
+    # Taken before the scan, so files added during it are caught next time
+    dir_mtime_ns = ELEMENTS_DIR.stat().st_mtime_ns
+    file_mtimes = _element_file_mtimes()
+    try:
+        stored = _read_json(INDEX_FILE)
+        index_mtime_ns = INDEX_FILE.stat().st_mtime_ns
+    except (OSError, ValueError):  # Missing or corrupt index.json
+        stored = None
+    
+    if (isinstance(stored, dict)
+            and stored.keys() == file_mtimes.keys()
+            and max(file_mtimes.values(), default=0) <= index_mtime_ns):
+        _INDEX.update(stored)
+        _FILE_MTIMES.update(file_mtimes)
+    else:
+        # Every element file is parsed anyway, so they are all cached too
+        _FILE_MTIMES.update(file_mtimes)
+        for element_id in file_mtimes:
+            element = _read_element_file(element_id)
+            if element is None:
+                continue
+            _ELEMENT_CACHE[element_id] = element
+            _INDEX[element_id] = _index_entry(element)
+        _repair_dependents()
+        _write_json(INDEX_FILE, _INDEX)
+    
+    # Forget elements cached before the load whose files are gone
+    for element_id in [cached_id for cached_id in _ELEMENT_CACHE if cached_id not in _INDEX]:
+        del _ELEMENT_CACHE[element_id]
+    _ROOTS.update(element_id for element_id, entry in _INDEX.items() if not entry["dependents"])
+    _DISK_MTIME_NS = dir_mtime_ns
+    _INDEX_LOADED = True
+
+def get_index() -> Dict[str, Dict[str, Any]]:
+    """Get the index of all elements, keyed by element ID"""
+    _ensure_index_loaded()
+    return _INDEX
+
+def known_ids():
+    """Get a set-like view of the IDs of every element in the knowledge base"""
+    return get_index().keys()
+
+def get_roots() -> set:
+    """Get the IDs of all elements that no other element depends on"""
+    _ensure_index_loaded()
+    return _ROOTS
+
+def find_dependency_cycles(adjacency: Dict[str, List[str]]) -> Tuple[List[List[str]], List[List[str]]]:
+    """
+    Find circular dependencies with Tarjan's strongly connected components
+    algorithm, run on an explicit stack so deep chains never hit the
+    recursion limit
+    
+    Args:
+        adjacency: Mapping of element ID to the IDs it depends on (IDs not in
+            the mapping are ignored)
+    
+    Returns:
+        The cycles (components of more than one element, or an element that
+        depends on itself) and the [from, to] edges to break so the rest of
+        the graph is acyclic
+    """
+    order = {}
+    lowlink = {}
+    component_stack = []
+    on_component_stack = set()
+    on_path = set()
+    cycles = []
+    edges_to_break = {}
+    
+    for root in adjacency:
+        if root in order:
+            continue
+        order[root] = lowlink[root] = len(order)
+        component_stack.append(root)
+        on_component_stack.add(root)
+        on_path.add(root)
+        work = [(root, iter(adjacency[root]))]
+        
+        while work:
+            node, deps = work[-1]
+            for dep in deps:
+                if dep not in adjacency:
+                    continue
+                if dep not in order:
+                    order[dep] = lowlink[dep] = len(order)
+                    component_stack.append(dep)
+                    on_component_stack.add(dep)
+                    on_path.add(dep)
+                    work.append((dep, iter(adjacency[dep])))
+                    break
+                if dep in on_component_stack:
+                    if dep in on_path:  # Back edge: closes a cycle
+                        edges_to_break[(node, dep)] = None
+                    if order[dep] < lowlink[node]:
+                        lowlink[node] = order[dep]
+            else:
+                # All dependencies visited, leave this node
+                work.pop()
+                on_path.discard(node)
+                if work:
+                    parent = work[-1][0]
+                    if lowlink[node] < lowlink[parent]:
+                        lowlink[parent] = lowlink[node]
+                if lowlink[node] == order[node]:
+                    component = []
+                    while True:
+                        member = component_stack.pop()
+                        on_component_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in adjacency[node]:
+                        cycles.append(sorted(component))
+    
+    return cycles, [list(edge) for edge in edges_to_break]
+
+def _stats_columns() -> Tuple[List[str], array, array, set, List[List[str]], List[List[str]]]:
+    """
+    Get the index as columns (element types, dependency counts, dependent
+    counts) plus the set of referenced-but-undefined IDs and the dependency
+    cycles, building it once per index change
+    """
+    global _STATS_COLUMNS
+    index = get_index()  # Picks up outside changes, which clear the columns
+    if _STATS_COLUMNS is None:
+        entries = index.values()
+        referenced_ids = set()
+        for entry in entries:
+            referenced_ids.update(entry["dependencies"])
+        cycles, edges_to_break = find_dependency_cycles(
+            {element_id: entry["dependencies"] for element_id, entry in index.items()}
+        )
+        _STATS_COLUMNS = (
+            [entry["type"] for entry in entries],
+            array('i', [len(entry["dependencies"]) for entry in entries]),
+            array('i', [len(entry["dependents"]) for entry in entries]),
+            referenced_ids.difference(index),
+            cycles,
+            edges_to_break
+        )
+    return _STATS_COLUMNS
+
+def _write_index_entry(element: CodeElement):
+    """Record an element in the index (called after its file has been written)"""
+    global _index_dirty, _STATS_COLUMNS
+    _ensure_index_loaded()
+    _INDEX[element.id] = _index_entry(element)
+    if element.dependents:
+        _ROOTS.discard(element.id)
+    else:
+        _ROOTS.add(element.id)
+    _index_dirty = True
+    _STATS_COLUMNS = None
+
+def _remove_index_entry(element_id: str):
+    """Drop an element from the index (must run before its file is deleted)"""
+    global _index_dirty, _STATS_COLUMNS
+    _ensure_index_loaded()
+    _INDEX.pop(element_id, None)
+    _ROOTS.discard(element_id)
+    _index_dirty = True
+    _STATS_COLUMNS = None
 
 @mcp.tool()
 def add_code_element(
@@ -189,6 +734,7 @@ def add_code_element(
         Success status, element info, and missing dependencies analysis
     """
     try:
+        now = datetime.now().isoformat()
         # Check if element already exists
         existing = load_element(element_id)
         if existing:
@@ -215,28 +761,27 @@ def add_code_element(
             code=code.strip(),
             description=description,
             dependencies=deps_list,
-            dependents=[],
+            dependents=find_dependents(element_id),
             source_file=source_file or None,
             line_range=line_range or None
         )
         
         # Save element
-        save_element(element)
+        save_element(element, now)
         
-        # Update dependents in referenced elements and check for missing dependencies
-        missing_dependencies = []
-        existing_dependencies = []
+        # Check for missing dependencies and update dependents in referenced elements
+        known = known_ids()
+        existing_dependencies = [dep_id for dep_id in deps_list if dep_id in known]
+        missing_dependencies = [dep_id for dep_id in deps_list if dep_id not in known]
         
-        for dep_id in deps_list:
+        for dep_id in existing_dependencies:
             dep_element = load_element(dep_id)
-            if dep_element:
-                # Add this element to the dependency's dependents list
-                if element_id not in dep_element.dependents:
-                    dep_element.dependents.append(element_id)
-                    save_element(dep_element)
-                existing_dependencies.append(dep_id)
-            else:
-                missing_dependencies.append(dep_id)
+            # Add this element to the dependency's dependents list
+            if element_id not in dep_element.dependents:
+                dep_element.dependents.append(element_id)
+                save_element(dep_element, now)
+        
+        update_metadata(now)
         
         return {
             "success": True,
@@ -280,6 +825,7 @@ def edit_dependencies(
         Success status and updated dependency info
     """
     try:
+        now = datetime.now().isoformat()
         # Load the element
         element = load_element(element_id)
         if not element:
@@ -299,13 +845,14 @@ def edit_dependencies(
         if operation == "replace":
             element.dependencies = dependencies
         elif operation == "add":
+            current = set(element.dependencies)
             for dep in dependencies:
-                if dep not in element.dependencies:
+                if dep not in current:
                     element.dependencies.append(dep)
+                    current.add(dep)
         elif operation == "remove":
-            for dep in dependencies:
-                if dep in element.dependencies:
-                    element.dependencies.remove(dep)
+            to_remove = set(dependencies)
+            element.dependencies = [dep for dep in element.dependencies if dep not in to_remove]
         else:
             return {
                 "success": False,
@@ -313,30 +860,16 @@ def edit_dependencies(
             }
         
         # Save the updated element
-        save_element(element)
+        save_element(element, now)
         
         # Update dependents lists in affected elements
-        # 1. Remove this element from old dependencies' dependents
-        for old_dep in original_deps:
-            if old_dep not in element.dependencies:  # Dependency was removed
-                old_dep_element = load_element(old_dep)
-                if old_dep_element and element_id in old_dep_element.dependents:
-                    old_dep_element.dependents.remove(element_id)
-                    save_element(old_dep_element)
-        
-        # 2. Add this element to new dependencies' dependents
-        missing_dependencies = []
-        existing_dependencies = []
+        sync_dependents(element_id, original_deps, element.dependencies, now)
         
-        for dep_id in element.dependencies:
-            dep_element = load_element(dep_id)
-            if dep_element:
-                if element_id not in dep_element.dependents:
-                    dep_element.dependents.append(element_id)
-                    save_element(dep_element)
-                existing_dependencies.append(dep_id)
-            else:
-                missing_dependencies.append(dep_id)
+        known = known_ids()
+        existing_dependencies = [dep_id for dep_id in element.dependencies if dep_id in known]
+        missing_dependencies = [dep_id for dep_id in element.dependencies if dep_id not in known]
+        
+        update_metadata(now)
         
         return {
             "success": True,
@@ -416,33 +949,31 @@ def find_missing_dependencies(element_id: str = "") -> Dict[str, Any]:
     """
     try:
         missing_deps = {}
-        elements_to_check = []
+        index = get_index()
         
         if element_id:
             # Check specific element
-            element = load_element(element_id)
-            if not element:
+            if element_id not in index:
                 return {
                     "success": False,
                     "message": f"Element '{element_id}' not found"
                 }
-            elements_to_check = [element]
+            elements_to_check = [element_id]
         else:
             # Check all elements
-            elements_to_check = get_all_elements()
+            elements_to_check = list(index)
         
         # Find missing dependencies
-        all_element_ids = {elem.id for elem in get_all_elements()}
-        
-        for element in elements_to_check:
-            for dep_id in element.dependencies:
-                if dep_id not in all_element_ids:
+        for checked_id in elements_to_check:
+            entry = index[checked_id]
+            for dep_id in entry["dependencies"]:
+                if dep_id not in index:
                     if dep_id not in missing_deps:
                         missing_deps[dep_id] = []
                     missing_deps[dep_id].append({
-                        "referencing_element": element.id,
-                        "element_type": element.type,
-                        "description": element.description
+                        "referencing_element": checked_id,
+                        "element_type": entry["type"],
+                        "description": entry["description"]
                     })
         
         return {
@@ -471,7 +1002,7 @@ def get_knowledge_tree_view(root_element_id: str = "", max_depth: int = 3) -> Di
         Tree visualization and statistics
     """
     try:
-        all_elements = {elem.id: elem for elem in get_all_elements()}
+        all_elements = get_index()
         
         if not all_elements:
             return {
@@ -481,28 +1012,36 @@ def get_knowledge_tree_view(root_element_id: str = "", max_depth: int = 3) -> Di
                 "statistics": {"total_elements": 0}
             }
         
-        def build_tree_recursive(element_id: str, depth: int = 0, visited: set = None) -> List[str]:
-            if visited is None:
-                visited = set()
-            
-            if depth > max_depth or element_id in visited:
-                return []
-            
-            visited.add(element_id)
+        def build_tree(root_id: str) -> List[str]:
+            # Depth-first walk with an explicit stack. `visited` holds the
+            # elements on the current path so cycles are cut; an entry with a
+            # depth of None marks the end of an element's subtree.
             lines = []
+            visited = set()
+            stack = [(root_id, 0)]
             
-            element = all_elements.get(element_id)
-            if not element:
-                lines.append("  " * depth + f"├── {element_id} [MISSING]")
-                return lines
-            
-            # Add current element
-            prefix = "├── " if depth > 0 else ""
-            lines.append("  " * depth + f"{prefix}{element.id} [{element.type}] - {element.description}")
-            
-            # Add dependencies
-            for dep_id in element.dependencies:
-                lines.extend(build_tree_recursive(dep_id, depth + 1, visited.copy()))
+            while stack:
+                element_id, depth = stack.pop()
+                if depth is None:
+                    visited.discard(element_id)
+                    continue
+                if depth > max_depth or element_id in visited:
+                    continue
+                
+                entry = all_elements.get(element_id)
+                if not entry:
+                    lines.append("  " * depth + f"├── {element_id} [MISSING]")
+                    continue
+                
+                # Add current element
+                prefix = "├── " if depth > 0 else ""
+                lines.append("  " * depth + f"{prefix}{element_id} [{entry['type']}] - {entry['description']}")
+                
+                # Add dependencies (pushed in reverse so they pop in order)
+                visited.add(element_id)
+                stack.append((element_id, None))
+                for dep_id in reversed(entry["dependencies"]):
+                    stack.append((dep_id, depth + 1))
             
             return lines
         
@@ -515,45 +1054,33 @@ def get_knowledge_tree_view(root_element_id: str = "", max_depth: int = 3) -> Di
                     "success": False,
                     "message": f"Root element '{root_element_id}' not found"
                 }
-            tree_lines = build_tree_recursive(root_element_id)
+            tree_lines = build_tree(root_element_id)
         else:
             # Show all top-level elements (elements with no dependents)
-            top_level = [elem for elem in all_elements.values() if not elem.dependents]
+            top_level = sorted(get_roots())
             
             if not top_level:
                 # If no clear top-level, show all elements
-                top_level = list(all_elements.values())
+                top_level = list(all_elements)
             
-            for element in top_level:
-                tree_lines.extend(build_tree_recursive(element.id))
+            for top_id in top_level:
+                tree_lines.extend(build_tree(top_id))
                 tree_lines.append("")  # Add spacing between trees
         
-        # Generate statistics
+        # Generate statistics from the cached index columns
+        types, dep_counts, dependent_counts = _stats_columns()[:3]
+        total_deps = sum(dep_counts)
         stats = {
-            "total_elements": len(all_elements),
-            "element_types": {},
-            "avg_dependencies": 0,
-            "max_dependencies": 0,
-            "orphaned_elements": 0
+            "total_elements": len(types),
+            "element_types": dict(Counter(types)),
+            "avg_dependencies": round(total_deps / len(types), 2) if types else 0,
+            "max_dependencies": max(dep_counts, default=0),
+            "orphaned_elements": sum(  # No dependencies and no dependents
+                1 for dep_count, dependent_count in zip(dep_counts, dependent_counts)
+                if dep_count == 0 and dependent_count == 0
+            )
         }
         
-        total_deps = 0
-        for element in all_elements.values():
-            # Count by type
-            stats["element_types"][element.type] = stats["element_types"].get(element.type, 0) + 1
-            
-            # Dependency stats
-            dep_count = len(element.dependencies)
-            total_deps += dep_count
-            stats["max_dependencies"] = max(stats["max_dependencies"], dep_count)
-            
-            # Orphaned elements (no dependencies and no dependents)
-            if not element.dependencies and not element.dependents:
-                stats["orphaned_elements"] += 1
-        
-        if len(all_elements) > 0:
-            stats["avg_dependencies"] = round(total_deps / len(all_elements), 2)
-        
         return {
             "success": True,
             "tree": "\n".join(tree_lines),
@@ -575,9 +1102,9 @@ def list_all_elements() -> Dict[str, Any]:
         List of all elements with summary information
     """
     try:
-        elements = get_all_elements()
+        index = get_index()
         
-        if not elements:
+        if not index:
             return {
                 "success": True,
                 "message": "Knowledge tree is empty",
@@ -585,21 +1112,22 @@ def list_all_elements() -> Dict[str, Any]:
                 "total": 0
             }
         
-        element_summaries = []
-        for element in sorted(elements, key=lambda x: x.id):
-            element_summaries.append({
-                "id": element.id,
-                "type": element.type,
-                "description": element.description,
-                "dependencies_count": len(element.dependencies),
-                "dependents_count": len(element.dependents),
-                "created_at": element.created_at
-            })
+        element_summaries = [
+            {
+                "id": element_id,
+                "type": entry["type"],
+                "description": entry["description"],
+                "dependencies_count": len(entry["dependencies"]),
+                "dependents_count": len(entry["dependents"]),
+                "created_at": entry["created_at"]
+            }
+            for element_id, entry in sorted(index.items())
+        ]
         
         return {
             "success": True,
             "elements": element_summaries,
-            "total": len(elements)
+            "total": len(index)
         }
         
     except Exception as e:
@@ -633,6 +1161,7 @@ def update_code_element(
         Success status and updated element info
     """
     try:
+        now = datetime.now().isoformat()
         element = load_element(element_id)
         if not element:
             return {
@@ -670,24 +1199,12 @@ def update_code_element(
             updated_fields.append("dependencies")
             dependencies_changed = True
             
-            # Clean up old dependency relationships
-            for old_dep in original_deps:
-                if old_dep not in dependencies:  # Dependency was removed
-                    old_dep_element = load_element(old_dep)
-                    if old_dep_element and element_id in old_dep_element.dependents:
-                        old_dep_element.dependents.remove(element_id)
-                        save_element(old_dep_element)
+            # Update dependency relationships
+            sync_dependents(element_id, original_deps, dependencies, now)
             
-            # Update new dependency relationships
-            for dep_id in dependencies:
-                dep_element = load_element(dep_id)
-                if dep_element:
-                    if element_id not in dep_element.dependents:
-                        dep_element.dependents.append(element_id)
-                        save_element(dep_element)
-                    existing_dependencies.append(dep_id)
-                else:
-                    missing_dependencies.append(dep_id)
+            known = known_ids()
+            existing_dependencies = [dep_id for dep_id in dependencies if dep_id in known]
+            missing_dependencies = [dep_id for dep_id in dependencies if dep_id not in known]
         
         if not updated_fields:
             return {
@@ -695,7 +1212,8 @@ def update_code_element(
                 "message": "No fields provided for update. Specify at least one field to update."
             }
         
-        save_element(element)
+        save_element(element, now)
+        update_metadata(now)
         
         result = {
             "success": True,
@@ -739,7 +1257,9 @@ def remove_element(element_id: str) -> Dict[str, Any]:
     Returns:
         Success status and cleanup information
     """
+    global _metadata_dirty, _cached_element_count
     try:
+        now = datetime.now().isoformat()
         element = load_element(element_id)
         if not element:
             return {
@@ -747,32 +1267,41 @@ def remove_element(element_id: str) -> Dict[str, Any]:
                 "message": f"Element '{element_id}' not found"
             }
         
-        # Clean up references in other elements
-        all_elements = get_all_elements()
+        # Clean up references in other elements. The element's own
+        # dependencies/dependents lists name every element that refers to it,
+        # so only those are loaded, and each of them is written once.
         updated_elements = []
+        neighbor_ids = dict.fromkeys(element.dependencies + element.dependents)
+        neighbor_ids.pop(element_id, None)
         
-        for other_element in all_elements:
-            if other_element.id == element_id:
+        for neighbor_id in neighbor_ids:
+            neighbor = load_element(neighbor_id)
+            if not neighbor:
                 continue
             
-            # Remove from dependencies
-            if element_id in other_element.dependencies:
-                other_element.dependencies.remove(element_id)
-                save_element(other_element)
-                updated_elements.append(f"{other_element.id} (removed from dependencies)")
+            cleaned = []
+            if element_id in neighbor.dependencies:
+                neighbor.dependencies = [dep for dep in neighbor.dependencies if dep != element_id]
+                cleaned.append(f"{neighbor_id} (removed from dependencies)")
+            if element_id in neighbor.dependents:
+                neighbor.dependents.remove(element_id)
+                cleaned.append(f"{neighbor_id} (removed from dependents)")
             
-            # Remove from dependents
-            if element_id in other_element.dependents:
-                other_element.dependents.remove(element_id)
-                save_element(other_element)
-                updated_elements.append(f"{other_element.id} (removed from dependents)")
+            if cleaned:
+                save_element(neighbor, now)
+                updated_elements.extend(cleaned)
         
         # Remove the element file
+        _remove_index_entry(element_id)
         element_file = ELEMENTS_DIR / f"{element_id}.json"
         element_file.unlink()
+        _mark_synced(element_file)
+        _ELEMENT_CACHE.pop(element_id, None)
+        _cached_element_count -= 1
+        _metadata_dirty = True
         
         # Update metadata
-        update_metadata()
+        update_metadata(now)
         
         return {
             "success": True,
@@ -788,6 +1317,30 @@ def remove_element(element_id: str) -> Dict[str, Any]:
             "message": f"Error removing element: {str(e)}"
         }
 
+def scan_dependency_hints(hint_lines: List[str]) -> Tuple[List[str], List[str]]:
+    """
+    Extract r(nnnn) module references and name() calls from dependency hint
+    lines. Calls are not taken from // comment lines.
+    
+    Returns:
+        (modules, dependencies) in the order they appear
+    """
+    modules = []
+    dependencies = []
+    
+    for line in hint_lines:
+        if line[:2] == '//':
+            # Only r(nnnn) module references are taken from // lines
+            modules.extend(["r" + match for match in _R_MOD_RE.findall(line)])
+        else:
+            # Module references and function calls in a single pass; each
+            # match fills exactly one of the two groups
+            refs = _DEP_REF_RE.findall(line)
+            modules.extend(["r" + module_ref for module_ref, _ in refs if module_ref])
+            dependencies.extend([func for module_ref, func in refs if not module_ref])
+    
+    return modules, dependencies
+
 @mcp.tool()
 def import_from_analysis_file(
     file_path: str,
@@ -806,18 +1359,13 @@ def import_from_analysis_file(
         Import results and extracted elements
     """
     try:
+        now = datetime.now().isoformat()
         if not os.path.exists(file_path):
             return {
                 "success": False,
                 "message": f"File not found: {file_path}"
             }
         
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Extract basic info from the file
-        lines = content.split('\n')
-        
         # Try to extract element info from comments
         extracted_info = {
             "functions": [],
@@ -829,90 +1377,107 @@ def import_from_analysis_file(
         current_function = None
         current_code = []
         in_function = False
-        
-        for line in lines:
-            line = line.strip()
-            
-            # Extract function definitions
-            if line.startswith('function ') and '(' in line:
-                if current_function and current_code:
-                    # Save previous function
-                    extracted_info["functions"].append({
-                        "id": current_function,
-                        "code": '\n'.join(current_code),
-                        "description": f"Function extracted from {file_path}"
-                    })
+        hint_lines = []
+        
+        # Bound once so the per-line loop only touches locals
+        add_function = extracted_info["functions"].append
+        add_hint_line = hint_lines.append
+        match_function = _FUNC_RE.match
+        search_hint = _DEP_HINT_RE.search
+        description = f"Function extracted from {file_path}"
+        
+        # Stream the file line by line (through a 1 MiB buffer) rather than
+        # reading it whole
+        with open(file_path, 'r', encoding='utf-8', buffering=1 << 20) as f:
+            for raw_line in f:
+                line = raw_line.strip()
+                
+                # Extract function definitions
+                func_match = match_function(line)
+                if func_match:
+                    if current_function and current_code:
+                        # Save previous function
+                        add_function({
+                            "id": current_function,
+                            "code": '\n'.join(current_code),
+                            "description": description
+                        })
                 
-                # Start new function
-                func_name = line.split('function ')[1].split('(')[0].strip()
-                current_function = func_name
-                current_code = [line]
-                in_function = True
-            elif in_function and (line.startswith('}') or line == ''):
-                # End of function
-                if line.startswith('}'):
+                    # Start new function
+                    current_function = func_match.group(1).strip()
+                    current_code = [line]
+                    in_function = True
+                elif in_function and (line.startswith('}') or line == ''):
+                    # End of function
+                    if line.startswith('}'):
+                        current_code.append(line)
+                    if current_function and current_code:
+                        add_function({
+                            "id": current_function,
+                            "code": '\n'.join(current_code),
+                            "description": description
+                        })
+                    current_function = None
+                    current_code = []
+                    in_function = False
+                elif in_function:
                     current_code.append(line)
-                if current_function and current_code:
-                    extracted_info["functions"].append({
-                        "id": current_function,
-                        "code": '\n'.join(current_code),
-                        "description": f"Function extracted from {file_path}"
-                    })
-                current_function = None
-                current_code = []
-                in_function = False
-            elif in_function:
-                current_code.append(line)
-            
-            # Extract dependencies from comments
-            if auto_extract and ('DEPENDENCIES' in line.upper() or 'CALLS:' in line.upper()):
-                # Look for dependency patterns in comments
-                if 'r(' in line:
-                    # Extract r(nnnn) module references
-                    import re
-                    matches = re.findall(r'r\((\d+)\)', line)
-                    for match in matches:
-                        extracted_info["modules"].append(f"r{match}")
                 
-                # Extract function calls
-                if '()' in line and not line.startswith('//'):
-                    func_matches = re.findall(r'(\w+)\(\)', line)
-                    for func in func_matches:
-                        extracted_info["dependencies"].append(func)
+                # Collect dependency comments, scanned in one batch below
+                if auto_extract and search_hint(line):
+                    add_hint_line(line)
+    
+        # Extract dependencies from comments
+        extracted_info["modules"], extracted_info["dependencies"] = scan_dependency_hints(hint_lines)
         
         # Add final function if exists
         if current_function and current_code:
-            extracted_info["functions"].append({
+            add_function({
                 "id": current_function,
                 "code": '\n'.join(current_code),
-                "description": f"Function extracted from {file_path}"
+                "description": description
             })
         
         # Import the extracted elements
         imported_elements = []
         failed_imports = []
+        new_elements = []
+        
+        # Existing elements that already reference the functions being
+        # imported, found in one pass over the index
+        index = get_index()
+        new_ids = {func_info["id"] for func_info in extracted_info["functions"]}.difference(index)
+        dependents_of = {}
+        for other_id, entry in index.items():
+            for dep in dict.fromkeys(entry["dependencies"]):
+                if dep in new_ids:
+                    dependents_of.setdefault(dep, []).append(other_id)
+        pending_ids = set(new_ids)
         
         for func_info in extracted_info["functions"]:
-            try:
-                # Check if element already exists
-                existing = load_element(func_info["id"])
-                if existing:
-                    failed_imports.append(f"Function '{func_info['id']}' already exists")
-                    continue
-                
-                element = CodeElement(
-                    id=func_info["id"],
-                    type="function",
-                    code=func_info["code"],
-                    description=func_info["description"],
-                    dependencies=[],
-                    dependents=[],
-                    source_file=file_path
-                )
-                save_element(element)
-                imported_elements.append(func_info["id"])
-            except Exception as e:
-                failed_imports.append(f"Failed to import '{func_info['id']}': {str(e)}")
+            # Check if element already exists (or appeared earlier in this file)
+            if func_info["id"] not in pending_ids:
+                failed_imports.append(f"Function '{func_info['id']}' already exists")
+                continue
+            pending_ids.discard(func_info["id"])
+            
+            new_elements.append(CodeElement(
+                id=func_info["id"],
+                type="function",
+                code=func_info["code"],
+                description=func_info["description"],
+                dependencies=[],
+                dependents=dependents_of.get(func_info["id"], []),
+                source_file=file_path
+            ))
+        
+        write_errors = save_elements_bulk(new_elements, now)
+        for element in new_elements:
+            if element.id in write_errors:
+                failed_imports.append(f"Failed to import '{element.id}': {write_errors[element.id]}")
+            else:
+                imported_elements.append(element.id)
+        update_metadata(now)
         
         return {
             "success": True,
@@ -941,84 +1506,66 @@ def get_knowledge_tree_stats() -> Dict[str, Any]:
         Detailed statistics and health metrics
     """
     try:
-        elements = get_all_elements()
+        types, dep_counts, dependent_counts, missing_deps, cycles, edges_to_break = _stats_columns()
         
-        if not elements:
+        if not types:
+            stats = {
+                "total_elements": 0,
+                "element_types": {},
+                "dependency_health": "N/A"
+            }
+            if _UNREADABLE_FILES:
+                stats["unreadable_element_files"] = dict(_UNREADABLE_FILES)
             return {
                 "success": True,
                 "message": "Knowledge tree is empty",
-                "stats": {
-                    "total_elements": 0,
-                    "element_types": {},
-                    "dependency_health": "N/A"
-                }
+                "stats": stats
             }
         
-        # Basic counts
+        # Reductions over the cached columns run in C rather than per element
+        element_count = len(types)
+        type_counts = Counter(types)
+        total_deps = sum(dep_counts)
+        max_deps = max(dep_counts)
+        
+        # One pass buckets elements by (no deps) | (no dependents) << 1, so
+        # bucket 3 holds the orphans (no deps and no dependents)
+        buckets = [0, 0, 0, 0]
+        for dep_count, dependent_count in zip(dep_counts, dependent_counts):
+            buckets[(dep_count == 0) | ((dependent_count == 0) << 1)] += 1
+        no_deps = buckets[1] + buckets[3]
+        no_dependents = buckets[2] + buckets[3]
+        orphans = buckets[3]
+        
+        # Calculate overall health score
+        inv_count = 1.0 / element_count
+        inv_deps = 1.0 / max(total_deps, 1)
+        orphan_penalty = orphans * inv_count * 20.0
+        missing_penalty = len(missing_deps) * inv_deps * 30.0
+        health_score = max(0, 100 - orphan_penalty - missing_penalty)
+        
         stats = {
-            "total_elements": len(elements),
-            "element_types": {},
+            "total_elements": element_count,
+            "element_types": dict(type_counts),
             "dependency_stats": {
-                "total_dependencies": 0,
-                "avg_dependencies_per_element": 0,
-                "max_dependencies": 0,
-                "elements_with_no_dependencies": 0,
-                "elements_with_no_dependents": 0
+                "total_dependencies": total_deps,
+                "avg_dependencies_per_element": round(total_deps * inv_count, 2),
+                "max_dependencies": max_deps,
+                "elements_with_no_dependencies": no_deps,
+                "elements_with_no_dependents": no_dependents
             },
             "health_metrics": {
-                "orphaned_elements": 0,  # No deps and no dependents
-                "missing_dependencies": 0,
-                "circular_dependencies": 0
-            }
+                "orphaned_elements": orphans,
+                "missing_dependencies": len(missing_deps),
+                "circular_dependencies": len(cycles),
+                "overall_health_score": round(health_score, 1)
+            },
+            "missing_dependency_list": list(missing_deps),
+            "circular_dependency_list": cycles,
+            "cycle_breaking_edges": edges_to_break
         }
-        
-        all_element_ids = {elem.id for elem in elements}
-        total_deps = 0
-        missing_deps = set()
-        
-        for element in elements:
-            # Count by type
-            stats["element_types"][element.type] = stats["element_types"].get(element.type, 0) + 1
-            
-            # Dependency analysis
-            dep_count = len(element.dependencies)
-            total_deps += dep_count
-            stats["dependency_stats"]["max_dependencies"] = max(
-                stats["dependency_stats"]["max_dependencies"], dep_count
-            )
-            
-            if dep_count == 0:
-                stats["dependency_stats"]["elements_with_no_dependencies"] += 1
-            
-            if len(element.dependents) == 0:
-                stats["dependency_stats"]["elements_with_no_dependents"] += 1
-            
-            # Health metrics
-            if dep_count == 0 and len(element.dependents) == 0:
-                stats["health_metrics"]["orphaned_elements"] += 1
-            
-            # Check for missing dependencies
-            for dep_id in element.dependencies:
-                if dep_id not in all_element_ids:
-                    missing_deps.add(dep_id)
-        
-        stats["dependency_stats"]["total_dependencies"] = total_deps
-        if len(elements) > 0:
-            stats["dependency_stats"]["avg_dependencies_per_element"] = round(
-                total_deps / len(elements), 2
-            )
-        
-        stats["health_metrics"]["missing_dependencies"] = len(missing_deps)
-        
-        # Calculate overall health score
-        health_score = 100
-        if len(elements) > 0:
-            orphan_penalty = (stats["health_metrics"]["orphaned_elements"] / len(elements)) * 20
-            missing_penalty = (len(missing_deps) / max(total_deps, 1)) * 30
-            health_score = max(0, health_score - orphan_penalty - missing_penalty)
-        
-        stats["health_metrics"]["overall_health_score"] = round(health_score, 1)
-        stats["missing_dependency_list"] = list(missing_deps)
+        if _UNREADABLE_FILES:
+            stats["unreadable_element_files"] = dict(_UNREADABLE_FILES)
         
         return {
             "success": True,
@@ -1039,18 +1586,25 @@ def get_working_directory_info() -> Dict[str, Any]:
     Returns:
         Current working directory paths and status
     """
+    global _kb_exists, _kb_exists_checked_at
     try:
-        base_working_dir = KNOWLEDGE_BASE_DIR.parent if KNOWLEDGE_BASE_DIR else None
+        kb_exists = False
+        if KNOWLEDGE_BASE_DIR:
+            checked_at = time.monotonic()
+            if checked_at - _kb_exists_checked_at >= _KB_EXISTS_TTL:
+                _kb_exists = KNOWLEDGE_BASE_DIR.exists()
+                _kb_exists_checked_at = checked_at
+            kb_exists = _kb_exists
         
         return {
             "success": True,
             "working_directory": {
-                "base_working_dir": str(base_working_dir) if base_working_dir else "Not initialized",
+                "base_working_dir": str(BASE_WORKING_DIR) if BASE_WORKING_DIR else "Not initialized",
                 "knowledge_tree_dir": str(KNOWLEDGE_BASE_DIR) if KNOWLEDGE_BASE_DIR else "Not initialized",
                 "elements_dir": str(ELEMENTS_DIR) if ELEMENTS_DIR else "Not initialized",
                 "metadata_file": str(METADATA_FILE) if METADATA_FILE else "Not initialized",
-                "knowledge_tree_exists": KNOWLEDGE_BASE_DIR.exists() if KNOWLEDGE_BASE_DIR else False,
-                "base_dir_is_absolute": base_working_dir.is_absolute() if base_working_dir else False
+                "knowledge_tree_exists": kb_exists,
+                "base_dir_is_absolute": _BASE_IS_ABSOLUTE
             }
         }
     except Exception as e:
@@ -1094,6 +1648,8 @@ Examples:
         print(f"✓ Knowledge tree created at: {KNOWLEDGE_BASE_DIR}")
         print(f"✓ Elements directory: {ELEMENTS_DIR}")
         print(f"✓ Metadata file: {METADATA_FILE}")
+        for element_id, error in _UNREADABLE_FILES.items():
+            print(f"✗ Skipped unreadable element file {element_id}.json: {error}", file=sys.stderr)
     except Exception as e:
         print(f"✗ Error initializing working directory: {e}", file=sys.stderr)
         sys.exit(1)